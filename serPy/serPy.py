@@ -1,23 +1,100 @@
-import struct
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from datetime import datetime, timedelta
-from PIL import Image
 import cv2
 import logging
 
+try:
+    import blosc2
+except ImportError:
+    blosc2 = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
-# Mapping of color_id to OpenCV Bayer conversion codes
+# SER header layout as a NumPy structured dtype; packing/unpacking the
+# 13 header fields runs at C level instead of through Python struct calls
+HEADER_DTYPE = np.dtype([
+    ("file_id", "S14"),
+    ("lu_id", "<u4"),
+    ("color_id", "<u4"),
+    ("little_endian", "<u4"),
+    ("image_width", "<u4"),
+    ("image_height", "<u4"),
+    ("pixel_depth", "<u4"),
+    ("frame_count", "<u4"),
+    ("observer", "S40"),
+    ("instrument", "S40"),
+    ("telescope", "S40"),
+    ("date_time", "<u8"),
+    ("date_time_utc", "<u8"),
+])
+
+# ECC alignment settings shared by every export: the identity warp is a
+# template copied per call, since findTransformECC mutates its warp argument
+_ECC_CRITERIA = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 50, 0.001)
+_IDENTITY_WARP = np.eye(2, 3, dtype=np.float32)
+
+# Magic bytes marking a Blosc2-compressed pixel payload; written as a
+# 16-byte sub-header (magic, n_chunks, chunk_frames) right after the header
+_BLOSC2_MAGIC = b"SERBLSC2"
+_BLOSC2_CHUNK_FRAMES = 64
+
+# Mapping of color_id to OpenCV Bayer conversion codes. BGR variants are
+# used so the debayered array feeds cv2.imwrite without a channel reorder
 BAYER_CONVERSION_CODES = {
-    8: cv2.COLOR_BAYER_RG2RGB,
-    9: cv2.COLOR_BAYER_GR2RGB,
-    10: cv2.COLOR_BAYER_GB2RGB,
-    11: cv2.COLOR_BAYER_BG2RGB,
+    8: cv2.COLOR_BAYER_RG2BGR,
+    9: cv2.COLOR_BAYER_GR2BGR,
+    10: cv2.COLOR_BAYER_GB2BGR,
+    11: cv2.COLOR_BAYER_BG2BGR,
     # Other Bayer patterns (e.g., CYMG) are less commonly supported in OpenCV
     # These require custom processing if needed
 }
 
-def save_frame_as_png(frame, output_path, color_id, align_rgb=True):
+# Mapping of color_id to one-shot Bayer-to-grayscale conversion codes,
+# avoiding the RGB intermediate when only a grayscale image is wanted
+BAYER_GRAY_CODES = {
+    8: cv2.COLOR_BAYER_RG2GRAY,
+    9: cv2.COLOR_BAYER_GR2GRAY,
+    10: cv2.COLOR_BAYER_GB2GRAY,
+    11: cv2.COLOR_BAYER_BG2GRAY,
+}
+
+def _align_channel(channel, reference, name):
+    """
+    Aligns one color channel to a reference channel using ECC translation.
+
+    Parameters:
+        channel (np.ndarray): Channel to align.
+        reference (np.ndarray): Reference channel (typically green).
+        name (str): Channel name used in warning messages.
+
+    Returns:
+        np.ndarray: The aligned channel, or the original channel if ECC
+        fails to converge.
+    """
+    warp_matrix = _IDENTITY_WARP.copy()
+    try:
+        _, warp_matrix = cv2.findTransformECC(
+            reference, channel, warp_matrix, cv2.MOTION_TRANSLATION, _ECC_CRITERIA
+        )
+        return cv2.warpAffine(
+            channel,
+            warp_matrix,
+            (reference.shape[1], reference.shape[0]),
+            flags=cv2.INTER_LINEAR + cv2.WARP_INVERSE_MAP,
+        )
+    except cv2.error as e:
+        logger.warning("%s channel alignment failed: %s", name, e)
+        return channel
+
+def save_frame_as_png(frame, output_path, color_id, align_rgb=True, mode="rgb"):
     """
     Saves a debayered and optionally RGB-aligned frame as a PNG file.
 
@@ -26,10 +103,19 @@ def save_frame_as_png(frame, output_path, color_id, align_rgb=True):
         output_path (str): File path for the output PNG.
         color_id (int): Color format ID, determines the Bayer pattern.
         align_rgb (bool): Whether to perform RGB alignment.
+        mode (str): "rgb" for a color PNG, "gray" to debayer straight to
+            grayscale in one conversion, skipping the RGB intermediate
+            and the alignment step.
     """
+    if mode not in ("rgb", "gray"):
+        raise ValueError(f"Unsupported mode: {mode}")
+
     if color_id in BAYER_CONVERSION_CODES:
         # Perform debayering using OpenCV
-        debayered_frame = cv2.cvtColor(frame, BAYER_CONVERSION_CODES[color_id])
+        if mode == "gray":
+            debayered_frame = cv2.cvtColor(frame, BAYER_GRAY_CODES[color_id])
+        else:
+            debayered_frame = cv2.cvtColor(frame, BAYER_CONVERSION_CODES[color_id])
     elif color_id == 0:  # MONO
         # No debayering needed, use the frame directly
         debayered_frame = frame
@@ -37,54 +123,33 @@ def save_frame_as_png(frame, output_path, color_id, align_rgb=True):
         raise ValueError(f"Unsupported or unknown color_id: {color_id}")
 
     if align_rgb and debayered_frame.ndim == 3:  # Only align if RGB
-        # Split channels
-        b, g, r = cv2.split(debayered_frame)
-
-        # Align each channel to green (reference)
-        criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 50, 0.001)
-        warp_mode = cv2.MOTION_TRANSLATION
-
-        # Align Blue to Green
-        warp_matrix = np.eye(2, 3, dtype=np.float32)
-        try:
-            _, warp_matrix = cv2.findTransformECC(g, b, warp_matrix, warp_mode, criteria)
-            b_aligned = cv2.warpAffine(
-                b,
-                warp_matrix,
-                (g.shape[1], g.shape[0]),
-                flags=cv2.INTER_LINEAR + cv2.WARP_INVERSE_MAP,
-            )
-        except cv2.error as e:
-            logger.warning("Blue channel alignment failed: %s", e)
-            b_aligned = b
-
-        # Align Red to Green
-        warp_matrix = np.eye(2, 3, dtype=np.float32)
-        try:
-            _, warp_matrix = cv2.findTransformECC(g, r, warp_matrix, warp_mode, criteria)
-            r_aligned = cv2.warpAffine(
-                r,
-                warp_matrix,
-                (g.shape[1], g.shape[0]),
-                flags=cv2.INTER_LINEAR + cv2.WARP_INVERSE_MAP,
-            )
-        except cv2.error as e:
-            logger.warning("Red channel alignment failed: %s", e)
-            r_aligned = r
-
-        # Merge aligned channels back into an RGB image
-        debayered_frame = cv2.merge([b_aligned, g, r_aligned])
-
-    # Convert NumPy array to a PIL Image
-    if debayered_frame.ndim == 2:  # Grayscale
-        image = Image.fromarray(debayered_frame)
-    elif debayered_frame.ndim == 3:  # RGB
-        image = Image.fromarray(debayered_frame, "RGB")
-    else:
+        # Channel views instead of cv2.split copies; the debayered array
+        # is BGR, so channel 0 is blue and channel 2 is red
+        b = debayered_frame[..., 0]
+        g = debayered_frame[..., 1]
+        r = debayered_frame[..., 2]
+
+        # Align blue and red to green (reference). The two alignments are
+        # independent and findTransformECC releases the GIL, so run them
+        # concurrently on a two-worker pool
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            b_future = executor.submit(_align_channel, b, g, "Blue")
+            r_future = executor.submit(_align_channel, r, g, "Red")
+            b_aligned = b_future.result()
+            r_aligned = r_future.result()
+
+        # Green is the reference and unchanged, so overwrite only the blue
+        # and red channels in place instead of a cv2.merge copy
+        debayered_frame[..., 0] = b_aligned
+        debayered_frame[..., 2] = r_aligned
+
+    # Write the PNG directly with OpenCV; the array is already grayscale
+    # or BGR, so no channel reorder or PIL round-trip is needed
+    if debayered_frame.ndim not in (2, 3):
         raise ValueError("Frame dimensions are invalid for PNG conversion.")
-
-    # Save the image as PNG
-    image.save(output_path)
+    # imwrite reports failure via its return value rather than raising
+    if not cv2.imwrite(output_path, debayered_frame):
+        raise IOError(f"Failed to write PNG to {output_path}")
     print(f"Frame saved as {output_path}")
     
 def ser_timestamp_to_datetime(timestamp):
@@ -109,23 +174,244 @@ def ser_timestamp_to_datetime(timestamp):
     # Return as a readable string
     return readable_datetime.isoformat()
 
-def write_ser(output_path, metadata, frames, timestamps=None):
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _bayer_sharpness_kernel(frames):
+        n, h, w = frames.shape
+        scores = np.empty(n, dtype=np.float64)
+        for f in numba.prange(n):
+            acc = 0.0
+            for y in range(1, h - 1):
+                for x in range(1, w - 1):
+                    lap = (
+                        4.0 * frames[f, y, x]
+                        - frames[f, y - 1, x]
+                        - frames[f, y + 1, x]
+                        - frames[f, y, x - 1]
+                        - frames[f, y, x + 1]
+                    )
+                    acc += lap * lap
+            scores[f] = acc / ((h - 2) * (w - 2))
+        return scores
+
+def bayer_sharpness(frames):
+    """
+    Computes a per-frame sharpness score directly from the raw mosaic.
+
+    The score is the mean squared 4-neighbor Laplacian over the interior
+    pixels of each frame, evaluated on the Bayer (or mono) data as stored
+    -- no debayer or grayscale intermediate is built. Higher means
+    sharper, making this suitable for lucky-imaging frame selection.
+    Runs as a parallel Numba kernel when numba is installed, otherwise
+    as a vectorized NumPy pass.
+
+    Parameters:
+        frames (np.ndarray): 3-D array of shape (frame_count, height, width).
+
+    Returns:
+        np.ndarray: float64 array of frame_count sharpness scores.
+    """
+    frames = np.asarray(frames)
+    if frames.ndim != 3:
+        raise ValueError("Expected a 3-D array of shape (frame_count, height, width).")
+    if frames.shape[1] < 3 or frames.shape[2] < 3:
+        raise ValueError("Frames must be at least 3x3 pixels to compute the Laplacian.")
+
+    if numba is not None:
+        return _bayer_sharpness_kernel(frames)
+
+    inner = frames[:, 1:-1, 1:-1].astype(np.float64)
+    lap = (
+        4.0 * inner
+        - frames[:, :-2, 1:-1]
+        - frames[:, 2:, 1:-1]
+        - frames[:, 1:-1, :-2]
+        - frames[:, 1:-1, 2:]
+    )
+    return np.mean(lap * lap, axis=(1, 2))
+
+def _copy_file_range(dst_file, src_file, offset, count):
+    """
+    Copies count bytes from src_file at offset to dst_file's current position.
+
+    Uses os.sendfile (zero-copy kernel path) where the platform supports
+    file-to-file transfers, falling back to chunked reads otherwise.
+    """
+    if count <= 0:
+        return
+    dst_file.flush()
+    remaining = count
+    off = offset
+    use_sendfile = hasattr(os, "sendfile")
+    while remaining > 0:
+        if use_sendfile:
+            try:
+                sent = os.sendfile(dst_file.fileno(), src_file.fileno(), off, remaining)
+            except OSError:
+                if off != offset:
+                    raise
+                # e.g. macOS, where sendfile requires a socket destination
+                use_sendfile = False
+                continue
+            if sent == 0:
+                raise ValueError("Unexpected end of file while copying frames.")
+        else:
+            src_file.seek(off)
+            chunk = src_file.read(min(remaining, 8 * 1024 * 1024))
+            if not chunk:
+                raise ValueError("Unexpected end of file while copying frames.")
+            dst_file.write(chunk)
+            dst_file.flush()
+            sent = len(chunk)
+        off += sent
+        remaining -= sent
+
+def copy_ser_range(src_path, dst_path, start, stop):
+    """
+    Copies a contiguous range of frames from one SER file to a new SER file.
+
+    Frames [start, stop) and their timestamps are copied verbatim at the
+    byte level -- no pixel data is decoded -- so extraction cost is pure
+    I/O regardless of frame size.
+
+    Parameters:
+        src_path (str): Path to the source SER file.
+        dst_path (str): Path to the output SER file.
+        start (int): Index of the first frame to copy.
+        stop (int): Index one past the last frame to copy.
+
+    Returns:
+        None
+    """
+    header_size = HEADER_DTYPE.itemsize
+    with open(src_path, "rb") as src_file, open(dst_path, "wb") as dst_file:
+        header = np.fromfile(src_file, dtype=HEADER_DTYPE, count=1)
+        if header.size != 1:
+            raise ValueError("Invalid SER file: Incomplete header.")
+        if header[0]["file_id"] != b"LUCAM-RECORDER":
+            raise ValueError("Invalid SER file: Incorrect File ID.")
+        if src_file.read(len(_BLOSC2_MAGIC)) == _BLOSC2_MAGIC:
+            raise ValueError("Cannot copy frame ranges from a compressed SER file.")
+
+        src_count = int(header[0]["frame_count"])
+        if not 0 <= start < stop <= src_count:
+            raise ValueError(f"Invalid frame range [{start}, {stop}) for {src_count} frames.")
+
+        # Write the header with the adjusted frame count
+        header["frame_count"] = stop - start
+        header.tofile(dst_file)
+
+        # Copy the pixel bytes of the selected range verbatim
+        frame_bytes = (
+            int(header[0]["image_width"])
+            * int(header[0]["image_height"])
+            * (int(header[0]["pixel_depth"]) // 8)
+        )
+        _copy_file_range(dst_file, src_file, header_size + start * frame_bytes, (stop - start) * frame_bytes)
+
+        # Copy the matching timestamp range (if present)
+        ts_offset = header_size + src_count * frame_bytes
+        if os.path.getsize(src_path) >= ts_offset + 8 * src_count:
+            _copy_file_range(dst_file, src_file, ts_offset + 8 * start, 8 * (stop - start))
+
+def _write_blosc2_frames(ser_file, frame_data):
+    """
+    Writes the pixel payload as Blosc2-compressed chunks.
+
+    Emits the 16-byte sub-header (magic, n_chunks, chunk_frames) followed by
+    one (u32 length, payload) pair per chunk of _BLOSC2_CHUNK_FRAMES frames.
+    """
+    frame_count = frame_data.shape[0]
+    # A floor of one frame per chunk keeps the range step nonzero for
+    # empty captures, which then write only the sub-header
+    chunk_frames = max(1, min(_BLOSC2_CHUNK_FRAMES, frame_count))
+    n_chunks = -(-frame_count // chunk_frames)
+
+    ser_file.write(_BLOSC2_MAGIC)
+    np.array([n_chunks, chunk_frames], dtype="<u4").tofile(ser_file)
+
+    frame_data = np.ascontiguousarray(frame_data)
+    for start in range(0, frame_count, chunk_frames):
+        chunk = frame_data[start:start + chunk_frames]
+        payload = blosc2.compress2(
+            chunk,
+            codec=blosc2.Codec.ZSTD,
+            filters=[blosc2.Filter.SHUFFLE],
+            typesize=frame_data.itemsize,
+        )
+        np.array([len(payload)], dtype="<u4").tofile(ser_file)
+        ser_file.write(payload)
+
+def _read_blosc2_frames(ser_file, frame_count, image_height, image_width, dtype):
+    """
+    Reads Blosc2-compressed frames and timestamps.
+
+    Expects ser_file to be positioned just past the sub-header magic.
+    Chunks are decompressed directly into a preallocated frame array.
+    """
+    sub_header = np.fromfile(ser_file, dtype="<u4", count=2)
+    if sub_header.size != 2:
+        raise ValueError("Unexpected end of file while reading frames.")
+    n_chunks, chunk_frames = int(sub_header[0]), int(sub_header[1])
+
+    frames = np.empty((frame_count, image_height, image_width), dtype=dtype)
+    start = 0
+    for _ in range(n_chunks):
+        length_data = np.fromfile(ser_file, dtype="<u4", count=1)
+        if length_data.size != 1:
+            raise ValueError("Unexpected end of file while reading frames.")
+        length = int(length_data[0])
+        payload = ser_file.read(length)
+        if len(payload) != length:
+            raise ValueError("Unexpected end of file while reading frames.")
+        stop = min(start + chunk_frames, frame_count)
+        blosc2.decompress2(payload, dst=frames[start:stop])
+        start = stop
+
+    timestamp_data = np.fromfile(ser_file, dtype="<u8", count=frame_count)
+    timestamps = timestamp_data.tolist() if timestamp_data.size == frame_count else None
+    return frames, timestamps
+
+def _writev_all(fd, buffers):
+    """
+    Writes a sequence of buffers to fd with os.writev, one iovec per call.
+
+    Loops on partial writes so regions larger than a single writev can
+    handle (e.g. >2GB payloads) are still fully written.
+    """
+    # Drop empty buffers before casting: memoryview.cast rejects
+    # zero-length multi-dimensional views
+    views = [memoryview(buf) for buf in buffers]
+    views = [view.cast("B") for view in views if view.nbytes]
+    while views:
+        written = os.writev(fd, views)
+        while views and written >= views[0].nbytes:
+            written -= views[0].nbytes
+            views.pop(0)
+        if written:
+            views[0] = views[0][written:]
+
+def write_ser(output_path, metadata, frames, timestamps=None, compression=None):
     """
     Writes an SER file with the given metadata, frames, and optional timestamps.
 
     Parameters:
         output_path (str): Path to the output SER file.
         metadata (dict): Metadata including file_id, dimensions, pixel depth, etc.
-        frames (list of np.ndarray): List of 2D frame arrays to write.
+        frames (np.ndarray or list of np.ndarray): 3D array of shape
+            (frame_count, height, width), or a sequence of 2D frame arrays.
         timestamps (list of int, optional): List of timestamps to write. Must match the number of frames.
+        compression (str, optional): Set to "blosc2" to write the pixel payload
+            as shuffled Blosc2/ZSTD chunks (requires the blosc2 package).
+            Compressed files are not valid SER for other readers.
 
     Returns:
         None
     """
-    # Define the header structure based on the specification
-    header_format = "<14sIIIIIII40s40s40s8s8s"
-    header_size = struct.calcsize(header_format)
-
+    if compression is not None and compression != "blosc2":
+        raise ValueError(f"Unsupported compression: {compression}")
+    if compression == "blosc2" and blosc2 is None:
+        raise ImportError("The blosc2 package is required for compression='blosc2'.")
     # Validate metadata
     if "file_id" not in metadata or metadata["file_id"] != "LUCAM-RECORDER":
         raise ValueError("Invalid metadata: file_id must be 'LUCAM-RECORDER'.")
@@ -140,132 +426,195 @@ def write_ser(output_path, metadata, frames, timestamps=None):
     if len(frames) != frame_count:
         raise ValueError("Number of frames does not match frame_count in metadata.")
 
-    # Calculate frame size
-    dtype = np.uint8 if pixel_depth == 8 else np.uint16
+    # SER pixel data is little-endian on disk; the explicit dtype makes the
+    # single astype below a no-op on little-endian hosts and one SIMD'd
+    # byteswap pass on big-endian ones
+    dtype = np.dtype("<u1") if pixel_depth == 8 else np.dtype("<u2")
     frame_size = frame_width * frame_height * (pixel_depth // 8)
 
-    # Open the output file
-    with open(output_path, "wb") as ser_file:
-        # Pack and write the header
-        header = struct.pack(
-            header_format,
-            metadata["file_id"].encode("utf-8"),
-            metadata["lu_id"],
-            metadata["color_id"],
-            int(metadata["little_endian"]),
-            frame_width,
-            frame_height,
-            pixel_depth,
-            frame_count,
-            metadata["observer"].encode("utf-8"),
-            metadata["instrument"].encode("utf-8"),
-            metadata["telescope"].encode("utf-8"),
-            struct.pack("<Q", metadata["date_time"]),
-            struct.pack("<Q", metadata["date_time_utc"]),
-        )
-        ser_file.write(header)
-
-        # Write the frames
-        for frame in frames:
-            if frame.shape != (frame_height, frame_width):
-                raise ValueError(f"Frame dimensions {frame.shape} do not match metadata ({frame_height}, {frame_width}).")
-            ser_file.write(frame.astype(dtype).tobytes())
-
-        # Write the timestamps (if provided)
-        if timestamps:
-            if len(timestamps) != frame_count:
-                raise ValueError("Number of timestamps does not match frame_count.")
-            for timestamp in timestamps:
-                ser_file.write(struct.pack("<Q", timestamp))
+    # Pack the header
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["file_id"] = metadata["file_id"].encode("utf-8")
+    header["lu_id"] = metadata["lu_id"]
+    header["color_id"] = metadata["color_id"]
+    header["little_endian"] = int(metadata["little_endian"])
+    header["image_width"] = frame_width
+    header["image_height"] = frame_height
+    header["pixel_depth"] = pixel_depth
+    header["frame_count"] = frame_count
+    header["observer"] = metadata["observer"].encode("utf-8")
+    header["instrument"] = metadata["instrument"].encode("utf-8")
+    header["telescope"] = metadata["telescope"].encode("utf-8")
+    header["date_time"] = metadata["date_time"]
+    header["date_time_utc"] = metadata["date_time_utc"]
+
+    # Stack the frames into one contiguous block; a single astype/stack pass
+    # replaces per-frame shape checks, conversions, and copies
+    frame_data = np.ascontiguousarray(np.asarray(frames), dtype=dtype)
+    if frame_data.shape != (frame_count, frame_height, frame_width):
+        raise ValueError(f"Frame dimensions {frame_data.shape[1:]} do not match metadata ({frame_height}, {frame_width}).")
+
+    # Validate the timestamps (if provided)
+    timestamp_data = None
+    if timestamps:
+        if len(timestamps) != frame_count:
+            raise ValueError("Number of timestamps does not match frame_count.")
+        timestamp_data = np.asarray(timestamps, dtype="<u8")
+
+    if compression == "blosc2":
+        with open(output_path, "wb") as ser_file:
+            header.tofile(ser_file)
+            _write_blosc2_frames(ser_file, frame_data)
+            if timestamp_data is not None:
+                timestamp_data.tofile(ser_file)
+    elif hasattr(os, "writev"):
+        # Submit header, frames, and timestamps as one iovec so the kernel
+        # writes all three regions without per-region syscalls
+        buffers = [header, frame_data]
+        if timestamp_data is not None:
+            buffers.append(timestamp_data)
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _writev_all(fd, buffers)
+        finally:
+            os.close(fd)
+    else:
+        with open(output_path, "wb") as ser_file:
+            header.tofile(ser_file)
+            frame_data.tofile(ser_file)
+            if timestamp_data is not None:
+                timestamp_data.tofile(ser_file)
 
     print(f"SER file written successfully to {output_path}")
 
-def read_ser(input_path):
+def read_ser(input_path, mode="array"):
     """
     Reads an SER file with the updated header structure.
 
     Parameters:
         input_path (str): Path to the input SER file.
+        mode (str): "array" returns frames as a plain 3-D array and
+            timestamps as a list. "raw" returns a structured memmap with a
+            'pixels' field per record and a uint64 memmap of timestamps;
+            nothing is decoded until a record is touched.
 
     Returns:
         dict: Metadata including width, height, pixel depth, frame count, and more.
-        list: List of frames (as NumPy arrays).
-        list: List of timestamps (if available, otherwise None).
+        np.ndarray: Frames as a 3-D array of shape (frame_count, height, width),
+            or a structured memmap in "raw" mode.
+        list: List of timestamps (if available, otherwise None), or a
+            uint64 memmap in "raw" mode.
     """
+    if mode not in ("array", "raw"):
+        raise ValueError(f"Unsupported mode: {mode}")
+    header_size = HEADER_DTYPE.itemsize
+
     with open(input_path, "rb") as ser_file:
-        # Define the header structure based on the specification
-        header_format = "<14sIIIIIII40s40s40s8s8s"
-        header_size = struct.calcsize(header_format)
-
-        # Read the header
-        header = ser_file.read(header_size)
-
-        # Unpack the header
-        (
-            file_id,
-            lu_id,
-            color_id,
-            little_endian,
-            image_width,
-            image_height,
-            pixel_depth,
-            frame_count,
-            observer,
-            instrument,
-            telescope,
-            date_time,
-            date_time_utc
-        ) = struct.unpack(header_format, header)
+        # Advise the kernel that access is sequential so it issues larger
+        # readahead; a single cheap syscall, skipped where unsupported
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(ser_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        # Read and unpack the header in one structured read
+        header = np.fromfile(ser_file, dtype=HEADER_DTYPE, count=1)
+        if header.size != 1:
+            raise ValueError("Invalid SER file: Incomplete header.")
+        header = header[0]
 
         # Validate the file
-        if file_id != b"LUCAM-RECORDER":
+        if header["file_id"] != b"LUCAM-RECORDER":
             raise ValueError("Invalid SER file: Incorrect File ID.")
 
-        # Prepare metadata
-        # Helper to decode fixed-width string fields without trailing null bytes
-        def _decode_field(value: bytes) -> str:
-            return value.decode("utf-8").rstrip("\x00").strip()
-
-        metadata = {
-            "file_id": _decode_field(file_id),
-            "lu_id": lu_id,
-            "color_id": color_id,
-            "little_endian": bool(little_endian),
-            "image_width": image_width,
-            "image_height": image_height,
-            "pixel_depth": pixel_depth,
-            "frame_count": frame_count,
-            "observer": _decode_field(observer),
-            "instrument": _decode_field(instrument),
-            "telescope": _decode_field(telescope),
-            "date_time": struct.unpack("<Q", date_time)[0],
-            "date_time_utc": struct.unpack("<Q", date_time_utc)[0],
-        }
-
-        # Determine pixel data type
-        dtype = np.uint8 if pixel_depth == 8 else np.uint16
-
-        # Calculate frame size
-        frame_size = image_width * image_height * (pixel_depth // 8)
-
-        # Read frames
-        frames = []
-        for _ in range(frame_count):
-            frame_data = ser_file.read(frame_size)
-            if not frame_data:
-                raise ValueError("Unexpected end of file while reading frames.")
-            frame = np.frombuffer(frame_data, dtype=dtype)
-            frames.append(frame.reshape((image_height, image_width)))
-
-        # Read timestamps (if available)
-        timestamps = []
-        remaining_data = ser_file.read()
-        if len(remaining_data) >= 8 * frame_count:
-            timestamps = [
-                struct.unpack_from("<Q", remaining_data, i * 8)[0]
-                for i in range(frame_count)
-            ]
-        else:
-            timestamps = None
+        # A Blosc2 sub-header magic right after the header marks a
+        # compressed payload, which cannot be memory-mapped
+        compressed = ser_file.read(len(_BLOSC2_MAGIC)) == _BLOSC2_MAGIC
+        if compressed:
+            if mode == "raw":
+                raise ValueError("mode='raw' is not supported for compressed SER files.")
+            if blosc2 is None:
+                raise ImportError("The blosc2 package is required to read compressed SER files.")
+            frames, timestamps = _read_blosc2_frames(
+                ser_file,
+                int(header["frame_count"]),
+                int(header["image_height"]),
+                int(header["image_width"]),
+                np.dtype("<u1") if int(header["pixel_depth"]) == 8 else np.dtype("<u2"),
+            )
+
+    # Prepare metadata
+    # Helper to decode fixed-width string fields without trailing null bytes
+    def _decode_field(value: bytes) -> str:
+        return value.decode("utf-8").rstrip("\x00").strip()
+
+    metadata = {
+        "file_id": _decode_field(header["file_id"]),
+        "lu_id": int(header["lu_id"]),
+        "color_id": int(header["color_id"]),
+        "little_endian": bool(header["little_endian"]),
+        "image_width": int(header["image_width"]),
+        "image_height": int(header["image_height"]),
+        "pixel_depth": int(header["pixel_depth"]),
+        "frame_count": int(header["frame_count"]),
+        "observer": _decode_field(header["observer"]),
+        "instrument": _decode_field(header["instrument"]),
+        "telescope": _decode_field(header["telescope"]),
+        "date_time": int(header["date_time"]),
+        "date_time_utc": int(header["date_time_utc"]),
+    }
+
+    if compressed:
+        return metadata, frames, timestamps
+
+    image_width = metadata["image_width"]
+    image_height = metadata["image_height"]
+    pixel_depth = metadata["pixel_depth"]
+    frame_count = metadata["frame_count"]
+
+    # Determine pixel data type (SER pixel data is little-endian on disk)
+    dtype = np.dtype("<u1") if pixel_depth == 8 else np.dtype("<u2")
+
+    # Memory-map the pixel payload instead of reading it eagerly; frames are
+    # zero-copy views backed by the page cache, so nothing is loaded until a
+    # frame is actually touched. SER captures can run to hundreds of GB.
+    frame_bytes = image_width * image_height * (pixel_depth // 8)
+    file_size = os.path.getsize(input_path)
+    if file_size < header_size + frame_bytes * frame_count:
+        raise ValueError("Unexpected end of file while reading frames.")
+    if mode == "raw":
+        # One record per frame; data['pixels'][10:20] slices with no decode
+        record_dtype = np.dtype([("pixels", dtype, (image_height, image_width))])
+        frames = np.memmap(
+            input_path,
+            dtype=record_dtype,
+            mode="r",
+            offset=header_size,
+            shape=(frame_count,),
+        )
+    else:
+        frames = np.memmap(
+            input_path,
+            dtype=dtype,
+            mode="r",
+            offset=header_size,
+            shape=(frame_count, image_height, image_width),
+        )
+
+    # Same hint for the mapping itself, so sequential scans over the
+    # frames trigger aggressive readahead instead of on-demand page faults
+    if hasattr(mmap, "MADV_SEQUENTIAL") and isinstance(frames.base, mmap.mmap):
+        frames.base.madvise(mmap.MADV_SEQUENTIAL)
+
+    # Read timestamps (if available). The timestamp region is tiny
+    # (8 bytes per frame), so in "array" mode it is materialized as a
+    # plain list; "raw" mode keeps the uint64 view.
+    ts_offset = header_size + frame_bytes * frame_count
+    if file_size >= ts_offset + 8 * frame_count:
+        timestamps = np.memmap(
+            input_path, dtype="<u8", mode="r", offset=ts_offset, shape=(frame_count,)
+        )
+        if mode != "raw":
+            timestamps = timestamps.tolist()
+    else:
+        timestamps = None
 
     return metadata, frames, timestamps
@@ -13,8 +13,11 @@ setup(
     install_requires=[
         "numpy",
         "opencv-python-headless",
-        "Pillow",
     ],
+    extras_require={
+        "blosc2": ["blosc2"],
+        "numba": ["numba"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -5,6 +5,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import numpy as np
+import pytest
 import serPy
 
 
@@ -25,7 +26,7 @@ def test_write_and_read_ser(tmp_path):
         "date_time": 637738597820000000,
         "date_time_utc": 637738597820000000,
     }
-    frames = [np.random.randint(0, 256, (height, width), dtype=np.uint8) for _ in range(nframes)]
+    frames = np.random.randint(0, 256, (nframes, height, width), dtype=np.uint8)
     timestamps = [metadata["date_time"] + i for i in range(nframes)]
 
     ser_file = tmp_path / "temp.ser"
@@ -34,7 +35,120 @@ def test_write_and_read_ser(tmp_path):
     read_metadata, read_frames, read_timestamps = serPy.read_ser(str(ser_file))
 
     assert read_metadata == metadata
-    assert len(read_frames) == len(frames)
-    for orig, loaded in zip(frames, read_frames):
-        assert np.array_equal(orig, loaded)
+    assert read_frames.shape == (nframes, height, width)
+    assert np.array_equal(frames, read_frames)
+    assert read_timestamps == timestamps
+
+
+def test_write_and_read_empty_ser(tmp_path):
+    width, height = 5, 4
+    metadata = {
+        "file_id": "LUCAM-RECORDER",
+        "lu_id": 1,
+        "color_id": 0,
+        "little_endian": True,
+        "image_width": width,
+        "image_height": height,
+        "pixel_depth": 8,
+        "frame_count": 0,
+        "observer": "Tester",
+        "instrument": "TestCam",
+        "telescope": "TestScope",
+        "date_time": 637738597820000000,
+        "date_time_utc": 637738597820000000,
+    }
+    ser_file = tmp_path / "empty.ser"
+    serPy.write_ser(str(ser_file), metadata, np.empty((0, height, width), dtype=np.uint8))
+
+    read_metadata, read_frames, read_timestamps = serPy.read_ser(str(ser_file))
+
+    assert read_metadata == metadata
+    assert read_frames.shape == (0, height, width)
+
+
+def test_copy_ser_range(tmp_path):
+    width, height, nframes = 5, 4, 10
+    metadata = {
+        "file_id": "LUCAM-RECORDER",
+        "lu_id": 1,
+        "color_id": 0,
+        "little_endian": True,
+        "image_width": width,
+        "image_height": height,
+        "pixel_depth": 8,
+        "frame_count": nframes,
+        "observer": "Tester",
+        "instrument": "TestCam",
+        "telescope": "TestScope",
+        "date_time": 637738597820000000,
+        "date_time_utc": 637738597820000000,
+    }
+    frames = np.random.randint(0, 256, (nframes, height, width), dtype=np.uint8)
+    timestamps = [metadata["date_time"] + i for i in range(nframes)]
+
+    src = tmp_path / "src.ser"
+    dst = tmp_path / "dst.ser"
+    serPy.write_ser(str(src), metadata, frames, timestamps)
+    serPy.copy_ser_range(str(src), str(dst), 3, 7)
+
+    read_metadata, read_frames, read_timestamps = serPy.read_ser(str(dst))
+
+    assert read_metadata["frame_count"] == 4
+    assert np.array_equal(frames[3:7], read_frames)
+    assert read_timestamps == timestamps[3:7]
+
+    raw_metadata, raw_data, raw_timestamps = serPy.read_ser(str(src), mode="raw")
+    assert raw_metadata == metadata
+    assert np.array_equal(raw_data["pixels"][3:7], frames[3:7])
+    assert np.array_equal(raw_timestamps, timestamps)
+
+    with pytest.raises(ValueError):
+        serPy.copy_ser_range(str(src), str(dst), 7, 3)
+
+
+def test_bayer_sharpness():
+    rng = np.random.default_rng(42)
+    sharp = rng.integers(0, 256, (6, 6), dtype=np.uint8)
+    flat = np.full((6, 6), 128, dtype=np.uint8)
+    scores = serPy.bayer_sharpness(np.stack([flat, sharp]))
+
+    assert scores.shape == (2,)
+    assert scores[0] == 0.0
+    assert scores[1] > 0.0
+
+    with pytest.raises(ValueError):
+        serPy.bayer_sharpness(sharp)
+
+    with pytest.raises(ValueError):
+        serPy.bayer_sharpness(np.zeros((2, 2, 2), dtype=np.uint8))
+
+
+def test_write_and_read_ser_blosc2(tmp_path):
+    pytest.importorskip("blosc2")
+    width, height, nframes = 8, 6, 100
+    metadata = {
+        "file_id": "LUCAM-RECORDER",
+        "lu_id": 1,
+        "color_id": 0,
+        "little_endian": True,
+        "image_width": width,
+        "image_height": height,
+        "pixel_depth": 16,
+        "frame_count": nframes,
+        "observer": "Tester",
+        "instrument": "TestCam",
+        "telescope": "TestScope",
+        "date_time": 637738597820000000,
+        "date_time_utc": 637738597820000000,
+    }
+    frames = np.random.randint(0, 65536, (nframes, height, width), dtype=np.uint16)
+    timestamps = [metadata["date_time"] + i for i in range(nframes)]
+
+    ser_file = tmp_path / "temp_blosc2.ser"
+    serPy.write_ser(str(ser_file), metadata, frames, timestamps, compression="blosc2")
+
+    read_metadata, read_frames, read_timestamps = serPy.read_ser(str(ser_file))
+
+    assert read_metadata == metadata
+    assert np.array_equal(frames, read_frames)
     assert read_timestamps == timestamps